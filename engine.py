@@ -1,12 +1,17 @@
 
+import io
 import random
-from collections import Counter
+import sys
+from array import array
 from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any
 
-from sandbox import BotProcess, BotTimeout, BotError
+from sandbox import BotProcess, InProcessBot, BotTimeout, BotError
 
 DEFAULT_SEED = 104
+FEEDBACK_TABLE_MAX = 1 << 24
+FEEDBACK_UNKNOWN = 0xFFFF
 CODE_COLORS = "code_colors"
 CODE_LENGTH = "code_length"
 GAME_SEED   = "game_seed"
@@ -17,6 +22,26 @@ FDBK_BLACK  = "black"
 FDBK_WHITE  = "white"
 FDBK_GUESS  = "guess"
 
+@dataclass(slots=True)
+class Feedback:
+    """
+    The outcome of a single guess.
+
+    Uses slots rather than a per-instance dict, which keeps the many Feedback
+    objects of a long game small. Fields can also be read by key, like the
+    dictionaries handed to bots (e.g., ``feedback["black"]``).
+    """
+    black: int
+    white: int
+    guess: Sequence[Any]
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
 def validate_code(
         code: Sequence[Any],
         settings: dict[str, object],
@@ -30,10 +55,10 @@ def validate_code(
     """
 
     length = settings[CODE_LENGTH]
-    colors = set(settings[CODE_COLORS])
+    colors = frozenset(settings[CODE_COLORS])
     if len(code) != length:
         return (False, "wrong length")
-    elif any(c not in colors for c in code):
+    elif not colors.issuperset(code):
         return (False, "invalid color symbol")
     else:
         return (True, "valid code")
@@ -42,7 +67,7 @@ def validate_code(
 def score_feedback(
         code: Sequence[Any], 
         guess: Sequence[Any]
-    ) -> dict[str, object]:
+    ) -> Feedback:
     """
     Calculate Mastermind-style feedback for a guess.
 
@@ -51,15 +76,107 @@ def score_feedback(
     color does not appear in the code.
     """
 
-    # Count the number of matches, filtering down to the position matches
-    black = sum(s == g for s, g in zip(code, guess))
+    # Count the position matches and, in the same pass, tally the colors of
+    # every peg in both the secret code and the guess
+    black = 0
+    secret_counts = {}
+    guess_counts = {}
+    for s, g in zip(code, guess):
+        black += s == g
+        secret_counts[s] = secret_counts.get(s, 0) + 1
+        guess_counts[g] = guess_counts.get(g, 0) + 1
+
+    # Count all color matches, then remove those already scored as black
+    matches = sum(min(n, guess_counts.get(c, 0)) for c, n in secret_counts.items())
+    white = matches - black
+
+    return Feedback(black, white, guess)
+
+
+def score_packed(
+        secret: Sequence[int],
+        guess: Sequence[int],
+        num_colors: int
+    ) -> int:
+    """
+    Calculate packed black and white peg counts for color-indexed codes.
+
+    Both codes must already be mapped to integer color indices in the range
+    ``0..num_colors-1``. Using small integers lets the peg counts live in
+    fixed-size lists rather than hashed Counter objects, and packing the
+    result into a single integer avoids building a tuple or dict per call.
+    This is the hot function for bots that simulate feedback over many
+    candidate codes, so they are welcome to import it.
+
+    Returns ``(black << 8) | white``.
+    """
+
+    black = 0
+    secret_counts = [0] * num_colors
+    guess_counts = [0] * num_colors
+    for s, g in zip(secret, guess):
+        black += s == g
+        secret_counts[s] += 1
+        guess_counts[g] += 1
+    white = sum(map(min, secret_counts, guess_counts)) - black
+
+    return (black << 8) | white
+
+
+def pack_code(code: Sequence[int], num_colors: int) -> int:
+    """
+    Pack a color-indexed code into a single integer.
+
+    The code is read as a base-``num_colors`` number, so every possible code
+    of a given length maps to a distinct value in ``0..num_colors**length-1``.
+    """
+    value = 0
+    for c in code:
+        value = value * num_colors + c
+    return value
+
 
-    # Count the number of color matches, filtering out the position matches
-    secret_counter = Counter(s for s, g in zip(code, guess) if s != g)
-    guess_counter = Counter(g for s, g in zip(code, guess) if s != g)
-    white = sum((secret_counter & guess_counter).values())
+class History(Sequence):
+    """
+    Turn-by-turn feedback for one game, stored column-wise.
 
-    return { FDBK_BLACK: black, FDBK_WHITE: white, FDBK_GUESS: guess }
+    The black counts, white counts, and guessed color indices live in flat
+    arrays preallocated for the maximum number of turns, rather than in one
+    object per turn. Indexing or iterating a History builds Feedback objects
+    on demand, so it reads like a list of them.
+    """
+
+    def __init__(self, code_colors: Sequence[Any], code_length: int, max_turns: int) -> None:
+        self.code_colors = code_colors
+        self.code_length = code_length
+        self.black = array("B", bytes(max_turns))
+        self.white = array("B", bytes(max_turns))
+        guess_type = "B" if len(code_colors) <= 256 else "I"
+        self.guesses = array(guess_type, [0]) * (max_turns * code_length)
+        self._turns = 0
+
+    def append(self, guess_idx: Sequence[int], black: int, white: int) -> None:
+        """ Record the color-indexed guess and feedback for the next turn. """
+        turn = self._turns
+        start = turn * self.code_length
+        self.black[turn] = black
+        self.white[turn] = white
+        self.guesses[start:start + self.code_length] = array(self.guesses.typecode, guess_idx)
+        self._turns = turn + 1
+
+    def __len__(self) -> int:
+        return self._turns
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._turns))]
+        if index < 0:
+            index += self._turns
+        if not 0 <= index < self._turns:
+            raise IndexError("history index out of range")
+        start = index * self.code_length
+        guess = [self.code_colors[i] for i in self.guesses[start:start + self.code_length]]
+        return Feedback(self.black[index], self.white[index], guess)
 
 
 class Game:
@@ -77,7 +194,8 @@ class Game:
     def __init__(
             self, 
             settings: dict[str, object], 
-            verbose: bool = True
+            verbose: bool = True,
+            sandbox: bool = True
         ) -> None:
         """
         Initialize a Game instance using the provided settings.
@@ -89,6 +207,10 @@ class Game:
 
         It may also include:
             - "game_seed":   an optional random number seed
+
+        Bots normally run in a separate process to protect the engine. Passing
+        ``sandbox=False`` runs a trusted bot inside the engine process instead,
+        which removes all IPC overhead (useful for benchmarking a bot).
         """
         # Validate the settings
         required_keys = [CODE_COLORS, CODE_LENGTH, MAX_TURNS]
@@ -99,30 +221,64 @@ class Game:
             settings[GAME_SEED] = DEFAULT_SEED
 
         self.verbose = verbose
+        self.sandbox = sandbox
+        self._out = io.StringIO() if verbose else None
         self.settings = settings
         self.rng = random.Random(self.settings[GAME_SEED])
 
-    def _rand_code(self) -> Sequence[Any]:
+        # Map each color to a small integer once so that scoring can work on
+        # color indices instead of arbitrary (hashable) color symbols
+        self._color_to_idx = {
+            c: i for i, c in enumerate(self.settings[CODE_COLORS])
+        }
+        self._K = len(self._color_to_idx)
+
+        # Cache what validating a guess needs so it is not rebuilt every turn
+        self._colors_set = frozenset(self.settings[CODE_COLORS])
+        self._len = self.settings[CODE_LENGTH]
+
+        # Remember the feedback for every (secret, guess) pair already scored,
+        # keyed on their packed codes. Entries are filled in lazily, so only
+        # pairs that actually come up are ever scored. Large games skip this.
+        self._num_codes = self._K ** self._len
+        if self._num_codes ** 2 <= FEEDBACK_TABLE_MAX:
+            table_size = self._num_codes ** 2
+            self._feedback_table = array("H", [FEEDBACK_UNKNOWN]) * table_size
+        else:
+            self._feedback_table = None
+
+    def _rand_codes(self, first_trial: int, num_trials: int) -> list[list[int]]:
         """
-        Generate a random secret code for the game.
+        Generate the random secret codes for a block of trials up front.
+
+        Each code is created by randomly selecting color indices (with
+        replacement), one per position. The secret for trial number ``t`` is
+        drawn from a generator seeded with ``game_seed + t``. Drawing indices
+        rather than colors consumes the generator identically, so the secrets
+        match a draw over the color list, and they never need to be mapped
+        back to indices for scoring.
 
-        The code is created by randomly selecting colors (with replacement)
-        from the list of allowed colors. The number of selections is equal to
-        the code length defined in the game settings.
-        
         Returns:
-            A sequence representing the randomly generated secret code.
+            A list of color-indexed secret codes, one per trial.
         """
         code_length = self.settings[CODE_LENGTH]
-        code_colors = self.settings[CODE_COLORS] 
-        return self.rng.choices(code_colors, k=code_length)
+        color_indices = range(self._K)
+        base_seed = self.settings[GAME_SEED]
+        rng = self.rng
+
+        secrets = []
+        for trial in range(first_trial, first_trial + num_trials):
+            if base_seed is not None:
+                rng.seed(base_seed + trial)
+            secrets.append(rng.choices(color_indices, k=code_length))
+        return secrets
 
     def run_game_loop(self, bot_module: str) -> dict[str, object]:
         """
         Run a full round of the game using the bot specified by its module name.
 
-        The game engine loads the bot in a separate process, generates a secret
-        code, and then repeatedly asks the bot to make guesses. After each guess
+        The game engine loads the bot in a separate process (unless sandboxing
+        is disabled), generates a secret code, and then repeatedly asks the bot to make guesses. After each guess
         the engine validates the code, scores the feedback (black and white pegs),
         and sends that feedback back to the bot. The loop continues until the bot
         guesses the secret code, runs out of turns, makes an error, or times out.
@@ -138,95 +294,202 @@ class Game:
                 - "reason":   A short explanation (e.g., "guessed code",
                               "timeout", or "exhausted turns").
                 - "secret":   The secret code generated for the game.
-                - "history":  A list of feedback dictionaries, one for each turn.
+                - "history":  A History holding one Feedback per turn.
 
             The bot process is always stopped before this function returns.
         """
-        secret = self._rand_code()
-        bot_process = None
-        history = []
-
-        def make_result(
-                turns: int, 
-                result: str, 
-                reason: str,
-                bot_info: dict[str, str] = { BOT_NAMEID: "unknown", BOT_AUTHOR: "unknown" }
-            ) -> dict[str, object]:
-            """ Helper function to build the result dictionary. """
-            return {
-                "turns": turns,
-                "result": result,
-                "reason": reason,
-                "secret": secret,
-                "history": history,
-                "botinfo": bot_info
-            }
+        return self.run_trials(bot_module, 1)[0]
+
+    def run_trials(
+            self,
+            bot_module: str,
+            num_trials: int,
+            first_trial: int = 0
+        ) -> list[dict[str, object]]:
+        """
+        Run several rounds of the game back-to-back against the same bot.
 
-        try:
-            # Start the bot process. We use a separate process for the bots to
-            # protect the engine from errors.
-            bot_process = BotProcess(bot_module, self.settings)
-            bot_process.start()
-        
-            # Get the bot's ID information
-            try:
-                bot_info = bot_process.call("bot_info")
-            except BotError as error:
-                return make_result(-1, "loss", f"exception: {error}")
-            except BotTimeout:
-                return make_result(-1, "loss", "timeout")
+        The bot process is started once and reused for every round. Between
+        rounds the worker is asked to reset, which builds a fresh bot instance
+        without paying the cost of a new process and module import. If the bot
+        process dies (e.g., after a timeout) it is restarted for the next round.
 
-            # Generate the secret code and display some game info to the user.
-            if self.verbose:
-                print(f"{bot_info[BOT_NAMEID]} by {bot_info[BOT_AUTHOR]}")
-                print(f"Secret Code: {secret}")
-                title = " -=| GUESSES |=- "
-                width = len(str(secret))
-                print(f"{title:^{width}} : B W")
+        The secret code for trial number ``t`` is drawn from a generator seeded
+        with ``game_seed + t``, so any block of trials can be played on its own
+        (e.g., by a parallel worker) and still see exactly the same secrets.
 
-            # Step through the bots turns. This loop may break prematurely if,
-            # for example, the bot either wins, timeouts, or crashes.
-            for turn in range(1, self.settings[MAX_TURNS] + 1):
+        Args:
+            bot_module: The name of the module containing the bot's code.
+            num_trials: The number of rounds to play.
+            first_trial: The trial number of the first round in this block.
 
-                # Allow the bot to take a turn
-                try:
-                    guess = bot_process.call("make_guess")
-                except BotError as error:
-                    return make_result(turn, "loss", f"exception: {error}", bot_info)
-                except BotTimeout:
-                    return make_result(turn, "loss", "timeout", bot_info)
-
-                # Evaluate the bot's guess
-                ok, _ = validate_code(guess, self.settings)
-                if not ok:
-                    return make_result(turn, "loss", "invalid code")
-                feedback = score_feedback(secret, guess)
-                history.append(feedback)
-                if self.verbose:
-                    print(f"{guess} :"
-                          f" {feedback[FDBK_BLACK]}"
-                          f" {feedback[FDBK_WHITE]}")
-                
-                # Provide feedback to the bot
+        Returns:
+            A list with one result dictionary per round, in the format
+            described by `run_game_loop`. The bot process is always stopped
+            before this function returns.
+        """
+        bot_runner = BotProcess if self.sandbox else InProcessBot
+        bot_process = bot_runner(bot_module, self.settings)
+        bot_info = None
+        results = []
+
+        try:
+            code_colors = self.settings[CODE_COLORS]
+            for secret_idx in self._rand_codes(first_trial, num_trials):
+                secret = [code_colors[i] for i in secret_idx]
+
+                # Bring up a fresh bot, reusing the worker process if possible
                 try:
-                    bot_process.call("receive_feedback", feedback)
+                    if bot_process.alive:
+                        bot_process.reset()
+                    else:
+                        bot_process.start()
+                    if bot_info is None:
+                        bot_info = bot_process.call("bot_info")
                 except BotError as error:
-                    return make_result(turn, "loss", f"exception: {error}", bot_info)
+                    bot_info = None
+                    results.append(self._make_result(
+                        secret, self._new_history(), -1, "loss", f"exception: {error}"))
+                    continue
                 except BotTimeout:
-                    return make_result(turn, "loss", "timeout", bot_info)
-                
-                # Check for win
-                if feedback[FDBK_BLACK] == self.settings[CODE_LENGTH]:
-                    return make_result(turn, "win", "guessed code", bot_info)
+                    bot_info = None
+                    results.append(self._make_result(
+                        secret, self._new_history(), -1, "loss", "timeout"))
+                    continue
 
-            # End of for-loop, bot must have exhausted its turns
-            return make_result(self.settings[MAX_TURNS], 
-                               "loss", "exhausted turns",
-                               bot_info)
+                try:
+                    results.append(self._play_round(
+                        bot_process, bot_info, secret, secret_idx))
+                finally:
+                    self._flush_output()
 
         finally:
-            if bot_process is not None:
-                try: 
-                    bot_process.stop()
-                except Exception:
-                    pass
+            try:
+                bot_process.stop()
+            except Exception:
+                pass
+
+        return results
+
+    def _new_history(self) -> History:
+        """ Create an empty History sized for a full game. """
+        return History(self.settings[CODE_COLORS], self._len, self.settings[MAX_TURNS])
+
+    def _flush_output(self) -> None:
+        """ Write out and clear the verbose output buffered for a game. """
+        if self._out is not None:
+            sys.stdout.write(self._out.getvalue())
+            sys.stdout.flush()
+            self._out.seek(0)
+            self._out.truncate()
+
+    def _make_result(
+            self,
+            secret: Sequence[Any],
+            history: History,
+            turns: int,
+            result: str,
+            reason: str,
+            bot_info: dict[str, str] = { BOT_NAMEID: "unknown", BOT_AUTHOR: "unknown" }
+        ) -> dict[str, object]:
+        """ Helper function to build the result dictionary. """
+        return {
+            "turns": turns,
+            "result": result,
+            "reason": reason,
+            "secret": secret,
+            "history": history,
+            "botinfo": bot_info
+        }
+
+    def _play_round(
+            self,
+            bot_process: BotProcess | InProcessBot,
+            bot_info: dict[str, str],
+            secret: Sequence[Any],
+            secret_idx: Sequence[int]
+        ) -> dict[str, object]:
+        """
+        Play a single round against a bot that has already been started.
+
+        Steps through the bot's turns until it guesses the secret code, exhausts
+        its turns, makes an error, or times out.
+        """
+        table = self._feedback_table
+        table_row = pack_code(secret_idx, self._K) * self._num_codes
+        history = self._new_history()
+
+        def make_result(*args: Any) -> dict[str, object]:
+            """ Helper function to build the result dictionary. """
+            return self._make_result(secret, history, *args)
+
+        # Display some game info to the user. Output is buffered and written
+        # out once per game to avoid taking the stdout lock on every turn.
+        out = self._out
+        if out is not None:
+            title = " -=| GUESSES |=- "
+            width = len(str(secret))
+            out.write(f"{bot_info[BOT_NAMEID]} by {bot_info[BOT_AUTHOR]}\n"
+                      f"Secret Code: {secret}\n"
+                      f"{title:^{width}} : B W\n")
+
+        # Step through the bots turns. This loop may break prematurely if,
+        # for example, the bot either wins, timeouts, or crashes. Feedback
+        # for each guess is delivered together with the next turn request.
+        # Settings and bound methods are looked up once, outside the loop.
+        max_turns = self.settings[MAX_TURNS]
+        code_length = self._len
+        num_colors = self._K
+        color_to_idx = self._color_to_idx
+        colors_set = self._colors_set
+        take_turn = bot_process.turn
+        record = history.append
+
+        feedback = None
+        for turn in range(1, max_turns + 1):
+
+            # Provide feedback to the bot and allow it to take a turn
+            try:
+                guess = take_turn(feedback)
+            except BotError as error:
+                return make_result(turn, "loss", f"exception: {error}", bot_info)
+            except BotTimeout:
+                return make_result(turn, "loss", "timeout", bot_info)
+
+            # Evaluate the bot's guess
+            if len(guess) != code_length or not colors_set.issuperset(guess):
+                return make_result(turn, "loss", "invalid code")
+            guess_idx = [color_to_idx[c] for c in guess]
+            if table is not None:
+                key = table_row + pack_code(guess_idx, num_colors)
+                packed = table[key]
+                if packed == FEEDBACK_UNKNOWN:
+                    packed = score_packed(secret_idx, guess_idx, num_colors)
+                    table[key] = packed
+            else:
+                packed = score_packed(secret_idx, guess_idx, num_colors)
+            black, white = packed >> 8, packed & 0xFF
+            feedback = { FDBK_BLACK: black, FDBK_WHITE: white, FDBK_GUESS: guess }
+            record(guess_idx, black, white)
+            if out is not None:
+                out.write(f"{guess} : {black} {white}\n")
+
+            # Check for win
+            if black == code_length:
+                break
+
+        # Provide feedback for the final guess to the bot
+        try:
+            bot_process.call("receive_feedback", feedback)
+        except BotError as error:
+            return make_result(turn, "loss", f"exception: {error}", bot_info)
+        except BotTimeout:
+            return make_result(turn, "loss", "timeout", bot_info)
+
+        if feedback[FDBK_BLACK] == code_length:
+            return make_result(turn, "win", "guessed code", bot_info)
+
+        # End of for-loop, bot must have exhausted its turns
+        return make_result(max_turns, 
+                           "loss", "exhausted turns",
+                           bot_info)
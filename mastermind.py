@@ -1,8 +1,10 @@
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import os
 import sys
 
 import engine
+import sandbox
 
 
 def parse_args():
@@ -10,24 +12,29 @@ def parse_args():
     Parse command line arguments.
 
     Usage:
-        python mastermind.py <bot_module> [num_trials]
+        python mastermind.py [--no-sandbox] <bot_module> [num_trials]
 
     - bot_module: required, name of the bot file/module
     - num_trials: optional, defaults to 1
+    - --no-sandbox: optional, run a trusted bot inside the engine process
     """
-    if len(sys.argv) < 2:
-        print("Usage: python mastermind.py <bot_module> [num_trials]")
+    args = sys.argv[1:]
+    use_sandbox = "--no-sandbox" not in args
+    args = [arg for arg in args if arg != "--no-sandbox"]
+
+    if len(args) < 1:
+        print("Usage: python mastermind.py [--no-sandbox] <bot_module> [num_trials]")
         sys.exit(1)
 
-    bot_filename = sys.argv[1]
+    bot_filename = args[0]
     bot_module = bot_filename[:-3]
     if not os.path.exists(bot_filename):
         print(f"Error: bot '{bot_filename}' does not exist")
         sys.exit(1)
 
-    if len(sys.argv) >= 3:
+    if len(args) >= 2:
         try:
-            num_trials = int(sys.argv[2])
+            num_trials = int(args[1])
             if num_trials < 1:
                 print("num_trials must be a positive integer.")
                 sys.exit(1)
@@ -37,11 +44,59 @@ def parse_args():
     else:
         num_trials = 1
 
-    return bot_module, num_trials
+    return bot_module, num_trials, use_sandbox
+
+
+def run_trials_parallel(
+        bot_module: str,
+        settings: dict[str, object],
+        num_trials: int,
+        num_workers: int,
+        use_sandbox: bool = True
+    ) -> list[dict[str, object]]:
+    """
+    Spread the trials over a pool of worker processes.
+
+    The trials are split into contiguous blocks and each block is played by
+    its own Game and bot process. Because every trial's secret code is derived
+    from its trial number, the results match a sequential run.
+
+    A ProcessPoolExecutor is used rather than multiprocessing.Pool because
+    Pool workers are daemonic and therefore cannot start bot processes.
+    """
+    block_size = max(1, num_trials // (8 * num_workers))
+    blocks = [
+        (first, min(block_size, num_trials - first))
+        for first in range(0, num_trials, block_size)
+    ]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=num_workers,
+                             mp_context=sandbox.MP_CONTEXT) as pool:
+        futures = [
+            pool.submit(_run_trial_block,
+                        bot_module, settings, first, count, use_sandbox)
+            for first, count in blocks
+        ]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    return results
+
+
+def _run_trial_block(
+        bot_module: str,
+        settings: dict[str, object],
+        first_trial: int,
+        num_trials: int,
+        use_sandbox: bool
+    ) -> list[dict[str, object]]:
+    """ Pool worker that plays one block of trials. """
+    mastermind = engine.Game(settings, verbose=False, sandbox=use_sandbox)
+    return mastermind.run_trials(bot_module, num_trials, first_trial)
 
 
 def main():
-    bot_module, num_trials = parse_args()
+    bot_module, num_trials, use_sandbox = parse_args()
 
     settings = {
         'game_seed': 12345677,
@@ -56,13 +111,18 @@ def main():
     # Multiple trials show abbreviated output
     # Single trial display the entire game
     if num_trials == 1:
-        mastermind = engine.Game(settings, verbose=True)
+        mastermind = engine.Game(settings, verbose=True, sandbox=use_sandbox)
     else:
-        mastermind = engine.Game(settings, verbose=False)
+        mastermind = engine.Game(settings, verbose=False, sandbox=use_sandbox)
 
-    # Run all of the games
-    for _ in range(num_trials):
-        result = mastermind.run_game_loop(bot_module)
+    # Run all of the games, spreading them across every CPU when possible
+    num_workers = os.cpu_count() or 1
+    if num_trials > 1 and num_workers > 1:
+        results = run_trials_parallel(bot_module, settings, num_trials,
+                                      num_workers, use_sandbox)
+    else:
+        results = mastermind.run_trials(bot_module, num_trials)
+    for result in results:
         if result["result"] == "win":
             total_turns += result["turns"]
         else:
@@ -12,6 +12,8 @@ class Bot:
       4) receive_feedback(self, feedback) Function with the outcome of the last guess
     """
 
+    __slots__ = ('rng', 'code_colors', 'code_length', 'bot_id')
+
     def __init__(self, settings):
         """
         Initializes the mastermind bot by saving important game settings and
@@ -56,11 +58,8 @@ class Bot:
         Returns: An iterable of `code_length` number of elements from `code_colors`
         """
 
-        # Randomly choose 4 different colors
-        guess = []
-        for _ in range(self.code_length):
-            guess.append(random.choice(self.code_colors))
-        return guess
+        # Randomly choose 4 colors using the bot's own seeded generator
+        return self.rng.choices(self.code_colors, k=self.code_length)
 
 
     def receive_feedback(self, feedback):
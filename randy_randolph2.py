@@ -12,6 +12,8 @@ class Bot:
       4) receive_feedback(self, feedback) Function with the outcome of the last guess
     """
 
+    __slots__ = ('rng', 'code_colors', 'code_length', 'bot_id', 'previous_guesses')
+
     def __init__(self, settings):
         """
         Initializes the mastermind bot by saving important game settings and
@@ -1,13 +1,27 @@
 
-from multiprocessing import Process, Pipe
+from multiprocessing import get_context, parent_process
 from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
 import importlib
+import queue
+import sys
+import threading
 import traceback
-from typing import Any, Optional
+from typing import Any, Optional, Union
 
 DEFAULT_START_TIMEOUT = 2.0
 DEFAULT_STOP_TIMEOUT = 1.0
 DEFAULT_CALL_TIMEOUT = 0.5
+PARENT_CHECK_INTERVAL = 1.0
+
+# Outside of Windows, bot processes are forked from a small forkserver that has
+# only the engine preloaded, rather than from the (possibly large) process that
+# wants to run them. Use MP_CONTEXT for any other processes that host games.
+if sys.platform != "win32":
+    MP_CONTEXT = get_context("forkserver")
+    MP_CONTEXT.set_forkserver_preload(["engine"])
+else:
+    MP_CONTEXT = get_context()
 
 class BotError(Exception):
     """ Raised for any error during import, startup, or calls. """
@@ -17,6 +31,118 @@ class BotTimeout(Exception):
     """ Raised when the bot takes too long to start or respond. """
     pass
 
+class _TurnCodec:
+    """
+    Compact binary encoding for the messages exchanged on every turn.
+
+    Turn requests and guess replies skip pickle and travel as a few raw bytes:
+    a tag, then either the black/white counts or one color index per peg. The
+    bot worker remembers its own last guess, so the feedback never has to echo
+    it back. Any message that cannot be encoded (e.g., a guess with an invalid
+    color) falls back to a pickled dict on the Pipe.
+    """
+
+    TURN_FIRST = 0x01   # [tag]
+    TURN = 0x02         # [tag][black][white]
+    GUESS_LIST = 0x03   # [tag][color index]...
+    GUESS_TUPLE = 0x04  # [tag][color index]...
+
+    def __init__(self, colors: list[Any], length: int) -> None:
+        self.colors = list(colors)
+        self.length = length
+        if len(self.colors) <= 256:
+            self.index = {c: i for i, c in enumerate(self.colors)}
+        else:
+            self.index = {}
+
+    def encode_turn(self, feedback: Optional[dict[str, object]]) -> Optional[bytes]:
+        """ Pack a turn request, or return None if it cannot be packed. """
+        if feedback is None:
+            return bytes((self.TURN_FIRST,))
+        black = feedback["black"]
+        white = feedback["white"]
+        if 0 <= black < 256 and 0 <= white < 256:
+            return bytes((self.TURN, black, white))
+        return None
+
+    def decode_turn(self, buf: bytes, last_guess: Any) -> Optional[dict[str, object]]:
+        """ Unpack a turn request into the feedback dict given to the bot. """
+        if buf[0] == self.TURN_FIRST:
+            return None
+        return {"black": buf[1], "white": buf[2], "guess": last_guess}
+
+    def encode_guess(self, guess: Any) -> Optional[bytes]:
+        """ Pack a guess, or return None if it cannot be packed. """
+        if type(guess) is list:
+            tag = self.GUESS_LIST
+        elif type(guess) is tuple:
+            tag = self.GUESS_TUPLE
+        else:
+            return None
+        if len(guess) != self.length:
+            return None
+        try:
+            return bytes((tag, *map(self.index.__getitem__, guess)))
+        except (KeyError, TypeError):
+            return None
+
+    def decode_guess(self, buf: bytes) -> Union[list[Any], tuple[Any, ...]]:
+        """ Unpack a guess, restoring the list or tuple the bot returned. """
+        guess = [self.colors[i] for i in buf[1:]]
+        return guess if buf[0] == self.GUESS_LIST else tuple(guess)
+
+
+class _TurnChannel:
+    """
+    Shared memory slots and wakeup events for the per-turn messages.
+
+    The memory holds two fixed-size slots, one for the engine's request and
+    one for the bot's reply, each laid out as ``[length: u16][payload]``. The
+    engine writes a packed turn into the request slot and sets
+    `request_ready`; the worker writes the packed guess into the reply slot
+    and sets `reply_ready`. Turns therefore never touch the Pipe or pickle.
+
+    An empty request means "read the next message from the Pipe", which is
+    how every other (variadic) call reaches the worker. An empty reply means
+    the bot's answer could not be packed and was sent on the Pipe instead.
+    """
+
+    def __init__(self, payload_size: int) -> None:
+        self.slot_size = 2 + payload_size
+        self.shm = SharedMemory(create=True, size=2 * self.slot_size)
+        self.request_ready = MP_CONTEXT.Event()
+        self.reply_ready = MP_CONTEXT.Event()
+
+    def write_request(self, payload: bytes) -> None:
+        self._write(0, payload)
+
+    def read_request(self) -> bytes:
+        return self._read(0)
+
+    def write_reply(self, payload: bytes) -> None:
+        self._write(self.slot_size, payload)
+
+    def read_reply(self) -> bytes:
+        return self._read(self.slot_size)
+
+    def close(self, unlink: bool = False) -> None:
+        """ Release the shared memory, destroying it if `unlink` is True. """
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+    def _write(self, offset: int, payload: bytes) -> None:
+        buf = self.shm.buf
+        size = len(payload)
+        buf[offset:offset + 2] = size.to_bytes(2, "little")
+        buf[offset + 2:offset + 2 + size] = payload
+
+    def _read(self, offset: int) -> bytes:
+        buf = self.shm.buf
+        size = int.from_bytes(buf[offset:offset + 2], "little")
+        return bytes(buf[offset + 2:offset + 2 + size])
+
+
 class BotProcess:
     """
     Persistent worker process that loads a bot class once and serves requests.
@@ -24,6 +150,8 @@ class BotProcess:
     Public API:
         - start()
         - call(method_name: str, *args, timeout: float | None)
+        - turn(feedback: dict | None, timeout: float | None)
+        - reset()
         - stop()
     """
 
@@ -38,10 +166,16 @@ class BotProcess:
         self.module_name = module_name
         self.class_name = class_name
         self.settings = settings
+        self._codec = _TurnCodec(
+            settings.get("code_colors", ()), settings.get("code_length", 0)
+        )
 
         # Connections to the bot
         self._parent_pipe = None
+        self._replies = None
+        self._channel = None
         self._bot_process = None
+        self._bot_class = None
 
         # Detect if the bot is unresponsive
         self._start_timeout = start_timeout
@@ -62,23 +196,54 @@ class BotProcess:
             return
 
         # Pipe is an IPC technique for sending messages back/forth to the bot
-        parent_conn, child_conn = Pipe()
+        parent_conn, child_conn = MP_CONTEXT.Pipe()
         self._parent_pipe = parent_conn
 
+        # A background thread blocks on the pipe and queues every reply, so
+        # waiting for a reply with a timeout never needs a poll() syscall
+        self._replies = queue.Queue()
+        threading.Thread(
+            target=_pipe_reader,
+            args=(parent_conn, self._replies),
+            daemon=True,
+        ).start()
+
+        # Shared memory carries the per-turn messages, which are tiny and
+        # fixed-size, without any kernel read/write or pickling
+        self._channel = _TurnChannel(1 + max(2, self._codec.length))
+
+        # With the 'fork' start method, a bot class imported here is inherited
+        # by every worker for free. If the import fails, leave it to the
+        # worker, which reports the failure in the usual way.
+        if self._bot_class is None and MP_CONTEXT.get_start_method() == "fork":
+            try:
+                module = importlib.import_module(self.module_name)
+                self._bot_class = getattr(module, self.class_name)
+            except Exception:
+                pass
+
         # Start the bot in a new process to avoid damaging the game engine
-        self._bot_process = Process(
+        self._bot_process = MP_CONTEXT.Process(
             target=_bot_worker_main,
-            args=(child_conn, self.module_name, self.class_name, self.settings),
+            args=(child_conn, self._channel, self.module_name,
+                  self.class_name, self._bot_class, self.settings),
             daemon=True,
         )
         self._bot_process.start()
 
+        # Only the worker should hold the child's end, so that the reader
+        # thread sees end-of-file as soon as the worker goes away
+        child_conn.close()
+
         # Wait for bot to send either a ready or an error message
-        if not parent_conn.poll(self._start_timeout):
+        try:
+            msg = self._replies.get(timeout=self._start_timeout)
+        except queue.Empty:
             self._kill()
             raise BotTimeout(f"Bot '{self.module_name}' failed to start in time")
 
-        msg = parent_conn.recv()
+        if msg is None:
+            msg = {"ok": False, "error": "Bot process exited"}
         if not msg.get("ok", False):
             err = msg.get("error", "unknown error")
             self._kill()
@@ -94,27 +259,89 @@ class BotProcess:
         timeout: float = DEFAULT_CALL_TIMEOUT,
     ) -> Any:
         """ Calls a bot method running in the worker process. """
+        return self._request(
+            {"op": "call", "method": method_name, "args": args},
+            f"{method_name}()",
+            timeout,
+        )
+
+    def turn(
+        self,
+        feedback: Optional[dict[str, object]],
+        timeout: float = DEFAULT_CALL_TIMEOUT,
+    ) -> Any:
+        """
+        Deliver the previous turn's feedback and ask the bot for a new guess.
+
+        Fuses `receive_feedback` and `make_guess` into a single round trip so
+        that each turn costs one message in each direction rather than two.
+        Pass None as the feedback on the first turn of a game.
+        """
+        msg = self._codec.encode_turn(feedback)
+        if msg is None:
+            msg = {"op": "turn", "feedback": feedback}
+        return self._request(
+            msg,
+            "receive_feedback()/make_guess()",
+            timeout,
+        )
+
+    def reset(self) -> None:
+        """
+        Replace the bot with a freshly constructed instance.
+
+        The worker process and the imported bot module are kept, so starting
+        a new game costs a single round trip rather than a process launch.
+        """
+        self._request({"op": "reset"}, "__init__()", self._start_timeout)
+
+    def _request(
+        self,
+        msg: Union[bytes, dict[str, object]],
+        what: str,
+        timeout: float,
+    ) -> Any:
+        """ Internal helper to send one request and wait for its reply. """
         if not self.alive or self._parent_pipe is None:
             raise BotError("Bot process not started")
 
-        # Send the call message to the bot
-        self._parent_pipe.send(
-            {"op": "call", "method": method_name, "args": args}
-        )
+        # Packed turns go through shared memory; everything else is pickled
+        # onto the Pipe after waking the worker with an empty request
+        channel = self._channel
+        if isinstance(msg, bytes):
+            channel.reply_ready.clear()
+            channel.write_request(msg)
+            channel.request_ready.set()
+            if not channel.reply_ready.wait(timeout):
+                self._kill()
+                raise BotTimeout(
+                    f"Bot '{self.module_name}' timed out calling {what}"
+                )
+            buf = channel.read_reply()
+            if buf:
+                return self._codec.decode_guess(buf)
+        else:
+            channel.write_request(b"")
+            channel.request_ready.set()
+            self._parent_pipe.send(msg)
 
         # Wait an appropriate time for the bot to respond
-        if not self._parent_pipe.poll(timeout):
+        try:
+            msg = self._replies.get(timeout=timeout)
+        except queue.Empty:
             self._kill()
             raise BotTimeout(
-                f"Bot '{self.module_name}' timed out calling {method_name}()"
+                f"Bot '{self.module_name}' timed out calling {what}"
             )
 
-        # Receive the bot's response and return it
-        msg = self._parent_pipe.recv()
+        # Return the bot's response
+        if msg is None:
+            self._kill()
+            raise BotError(f"Bot '{self.module_name}' exited during {what}")
         if not msg.get("ok", False):
             err = msg.get("error", "Unknown error")
             raise BotError(
-                f"Bot '{self.module_name}' error in {method_name}():\n{err}"
+                f"Bot '{self.module_name}' error in {what}:\n{err}"
             )
         return msg.get("result", None)
 
@@ -125,6 +352,8 @@ class BotProcess:
 
         # Alert the bot that it is finishing so it can clean up open resources
         try:
+            self._channel.write_request(b"")
+            self._channel.request_ready.set()
             self._parent_pipe.send({"op": "stop"})
             if self._bot_process is not None:
                 self._bot_process.join(timeout=DEFAULT_STOP_TIMEOUT)
@@ -140,40 +369,171 @@ class BotProcess:
                 self._bot_process.terminate()
                 self._bot_process.join(timeout=DEFAULT_STOP_TIMEOUT)
         finally:
+            if self._channel is not None:
+                try:
+                    self._channel.close(unlink=True)
+                except Exception:
+                    pass
+            if self._parent_pipe is not None:
+                self._parent_pipe.close()
             self._bot_process = None
             self._parent_pipe = None
+            self._replies = None
+            self._channel = None
             self.alive = False
 
 
+class InProcessBot:
+    """
+    Runs a trusted bot directly inside the engine process.
+
+    Offers the same API as BotProcess but skips the worker process and all
+    IPC, so every call is a plain method call. There is no protection: a bot
+    that crashes, hangs, or misbehaves takes the engine down with it, and the
+    timeouts are accepted only for compatibility and are never enforced.
+    """
+
+    def __init__(
+        self,
+        module_name: str,
+        settings: dict[str, object],
+        class_name: str = "Bot",
+        start_timeout: float = DEFAULT_START_TIMEOUT,
+    ) -> None:
+
+        self.module_name = module_name
+        self.class_name = class_name
+        self.settings = settings
+        self._bot_class = None
+        self._bot = None
+        self.alive = False
+
+    def start(self) -> None:
+        """ Import the bot class and create a bot instance. """
+        if self.alive:
+            return
+
+        if self._bot_class is None:
+            try:
+                module = importlib.import_module(self.module_name)
+            except Exception:
+                full_error = traceback.format_exc()
+                raise BotError(
+                    f"Bot '{self.module_name}' failed to start:\n"
+                    f"Import failed:\n{full_error}"
+                )
+            try:
+                self._bot_class = getattr(module, self.class_name)
+            except AttributeError:
+                raise BotError(
+                    f"Bot '{self.module_name}' failed to start:\n"
+                    f"Class '{self.class_name}' not found in module '{self.module_name}'"
+                )
+
+        self.reset()
+        self.alive = True
+
+    def call(
+        self,
+        method_name: str,
+        *args: Any,
+        timeout: float = DEFAULT_CALL_TIMEOUT,
+    ) -> Any:
+        """ Calls a bot method directly. """
+        if self._bot is None:
+            raise BotError("Bot not started")
+        try:
+            method = getattr(self._bot, method_name)
+        except AttributeError:
+            raise BotError(
+                f"Bot '{self.module_name}' error in {method_name}():\n"
+                f"No such method: {method_name}"
+            )
+        try:
+            return method(*args)
+        except Exception:
+            full_error = traceback.format_exc()
+            raise BotError(
+                f"Bot '{self.module_name}' error in {method_name}():\n{full_error}"
+            )
+
+    def turn(
+        self,
+        feedback: Optional[dict[str, object]],
+        timeout: float = DEFAULT_CALL_TIMEOUT,
+    ) -> Any:
+        """ Deliver the previous turn's feedback and ask for a new guess. """
+        if feedback is not None:
+            self.call("receive_feedback", feedback)
+        return self.call("make_guess")
+
+    def reset(self) -> None:
+        """ Replace the bot with a freshly constructed instance. """
+        try:
+            self._bot = self._bot_class(self.settings)
+        except Exception:
+            full_error = traceback.format_exc()
+            raise BotError(
+                f"Bot '{self.module_name}' error in __init__():\n"
+                f"Instantiation failed:\n{full_error}"
+            )
+
+    def stop(self) -> None:
+        """ Discard the bot instance. """
+        self._bot = None
+        self.alive = False
+
+
+def _pipe_reader(conn: Connection, replies: queue.Queue) -> None:
+    """
+    Reader thread executed inside the engine process.
+
+    Forwards every message the worker sends into `replies`, followed by None
+    once the pipe is closed from either end.
+    """
+    try:
+        while True:
+            replies.put(conn.recv())
+    except (EOFError, OSError):
+        pass
+    finally:
+        replies.put(None)
+
+
 def _bot_worker_main(
     conn: Connection,
+    channel: _TurnChannel,
     module_name: str,
     class_name: str,
+    bot_class: Optional[type],
     settings: dict[str, object],
 ) -> None:
     """
     Worker entry point executed inside the child process.
 
-    Loads the bot module/class, instantiates it, and responds to method calls.
+    Loads the bot module/class (unless the engine already did), instantiates
+    it, and responds to method calls.
     """
 
-    # Import bot module
-    try:
-        module = importlib.import_module(module_name)
-    except Exception:
-        full_error = traceback.format_exc()
-        conn.send({"ok": False, "error": "Import failed:\n" + full_error})
-        return
+    # Import bot module and look up the bot class
+    if bot_class is not None:
+        BotClass = bot_class
+    else:
+        try:
+            module = importlib.import_module(module_name)
+        except Exception:
+            full_error = traceback.format_exc()
+            conn.send({"ok": False, "error": "Import failed:\n" + full_error})
+            return
 
-    # Look up bot class
-    try:
-        BotClass = getattr(module, class_name)
-    except AttributeError:
-        conn.send({
-            "ok": False,
-            "error": f"Class '{class_name}' not found in module '{module_name}'"
-        })
-        return
+        try:
+            BotClass = getattr(module, class_name)
+        except AttributeError:
+            conn.send({
+                "ok": False,
+                "error": f"Class '{class_name}' not found in module '{module_name}'"
+            })
+            return
 
     # Instantiate bot
     try:
@@ -194,15 +554,34 @@ def _bot_worker_main(
         conn.send({"ok": False, "error": "bot_info() failed:\n" + full_error})
         return
 
+    # Per-turn messages are packed by hand instead of being pickled
+    codec = _TurnCodec(
+        settings.get("code_colors", ()), settings.get("code_length", 0)
+    )
+    last_guess = None
+    parent = parent_process()
+
     # Enter an loop to respond to all calls; quit if call is to 'stop'
     # If this loop ever exits, the bot process finishes
     while True:
 
-        # Receive the call message from the pipe
-        try:
-            msg = conn.recv()
-        except EOFError:
-            break
+        # Wait for the engine to post a request, giving up if it has died
+        if not channel.request_ready.wait(PARENT_CHECK_INTERVAL):
+            if parent is not None and not parent.is_alive():
+                break
+            continue
+        channel.request_ready.clear()
+
+        # Packed turns arrive in shared memory; anything else is on the pipe
+        buf = channel.read_request()
+        via_channel = bool(buf)
+        if via_channel:
+            msg = {"op": "turn", "feedback": codec.decode_turn(buf, last_guess)}
+        else:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                break
 
         # Verify that message has the right basic format
         if not isinstance(msg, dict):
@@ -238,5 +617,40 @@ def _bot_worker_main(
 
             continue
 
+        # Bot should start over with a brand new instance
+        if op == "reset":
+            try:
+                bot_instance = BotClass(settings)
+                conn.send({"ok": True, "result": None})
+            except Exception:
+                full_error = traceback.format_exc()
+                conn.send({"ok": False, "error": "Instantiation failed:\n" + full_error})
+
+            continue
+
+        # Bot should take a turn: learn from the last guess and guess again
+        if op == "turn":
+            feedback = msg.get("feedback")
+            try:
+                if feedback is not None:
+                    bot_instance.receive_feedback(feedback)
+                result = bot_instance.make_guess()
+                last_guess = result
+                reply = codec.encode_guess(result)
+                if reply is None or not via_channel:
+                    conn.send({"ok": True, "result": result})
+                    reply = b""
+            except Exception:
+                full_error = traceback.format_exc()
+                conn.send({"ok": False, "error": full_error})
+                reply = b""
+
+            # Answer in shared memory; empty means "look on the pipe"
+            if via_channel:
+                channel.write_reply(reply)
+                channel.reply_ready.set()
+
+            continue
+
         # Recieved a call message for an invalid operation
         conn.send({"ok": False, "error": f"Unknown call: {op}"})